@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import os
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date
+from functools import cache
 
 import requests
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 
 
 @dataclass
@@ -59,6 +64,34 @@ PAGES: list[Page] = [
 WIKI_API_URL = "https://oldschool.runescape.wiki/api.php"
 USER_AGENT = "hi I'm pajlada on Discord, just doing some stuff for quest helper"
 
+# Only the quest tables are ever read, so don't build a tree for the rest of the page.
+# The class attribute isn't split into its values yet when the strainer runs
+QUEST_TABLE_STRAINER = SoupStrainer(
+    "table", class_=re.compile(r"(?:^|\s)oqg-table(?:\s|$)")
+)
+
+# e.g. "Camelot, #1"
+SERIES_RE = re.compile(r"(.+),\s*#([0-9A-Za-z]+)")
+
+# Prefixes/suffixes in the optimal quest guides that aren't part of the quest name
+QUEST_ORDER_NAME_NOISE_RE = re.compile(r"Unlock: | \(miniquest\)")
+
+# Release dates are always written with English month names, so skip strptime
+MONTHS = {
+    "January": 1,
+    "February": 2,
+    "March": 3,
+    "April": 4,
+    "May": 5,
+    "June": 6,
+    "July": 7,
+    "August": 8,
+    "September": 9,
+    "October": 10,
+    "November": 11,
+    "December": 12,
+}
+
 
 def cell_text(cell: Tag) -> str:
     return " ".join(cell.stripped_strings)
@@ -68,7 +101,7 @@ def parse_series(value: str) -> dict[str, int | str | None] | None:
     if value == "N/A":
         return None
 
-    match = re.fullmatch(r"(.+),\s*#([0-9A-Za-z]+)", value)
+    match = SERIES_RE.fullmatch(value)
     if not match:
         return {"name": value.strip()}
 
@@ -82,15 +115,33 @@ def parse_series(value: str) -> dict[str, int | str | None] | None:
     }
 
 
-def find_quest_table(soup: BeautifulSoup) -> Tag:
-    for table in soup.select("table.oqg-table"):
-        headers = {cell_text(th).lower() for th in table.select("tr th")}
+def table_headers(table: Tag) -> list[str]:
+    # The column headers all live in the table's first row
+    header_row = table.find("tr")
+    if not isinstance(header_row, Tag):
+        return []
+
+    return [cell_text(th).lower() for th in header_row.find_all("th")]
+
+
+def find_quest_table(soup: BeautifulSoup) -> tuple[Tag, list[str]]:
+    for table in soup.find_all("table", class_="oqg-table"):
+        headers = table_headers(table)
         if {"name", "difficulty", "length", "series", "release date"}.issubset(headers):
-            return table
+            return table, headers
 
     raise ValueError("could not find the quest table (table.oqg-table)")
 
 
+def find_first_link(row: Tag) -> Tag | None:
+    for cell in row.find_all("td"):
+        link = cell.find("a", title=True)
+        if isinstance(link, Tag):
+            return link
+
+    return None
+
+
 def parse_number(value: str | None) -> int | str | None:
     if value is None:
         return None
@@ -101,30 +152,54 @@ def parse_number(value: str | None) -> int | str | None:
     return value
 
 
-def parse_rows(table: Tag) -> list[dict[str, object]]:
-    headers = [cell_text(th).strip().lower() for th in table.select("tr th")]
+# Many quests share a release date, so most rows hit the cache
+@cache
+def parse_release_date(value: str) -> date:
+    # e.g. "4 January 2001"
+    try:
+        day, month, year = value.split()
+        return date(int(year), MONTHS[month.capitalize()], int(day))
+    except (ValueError, KeyError) as e:
+        raise ValueError(f"unrecognised release date {value!r}") from e
+
+
+def parse_rows(table: Tag, headers: list[str]) -> list[dict[str, object]]:
     quests: list[dict[str, object]] = []
 
-    for row in table.select("tr[data-rowid]"):
+    # Resolve column positions once instead of building a dict for every row
+    columns = {header: index for index, header in enumerate(headers)}
+    number_column = columns.get("#")
+    name_column = columns["name"]
+    difficulty_column = columns["difficulty"]
+    length_column = columns["length"]
+    quest_points_column = columns.get("")
+    series_column = columns["series"]
+    release_date_column = columns["release date"]
+
+    for row in table.find_all("tr", attrs={"data-rowid": True}):
         cells = row.find_all("td", recursive=False)
         if len(cells) < len(headers):
             raise ValueError(
                 f"tr[data-rowid]: got {len(cells)} columns, expected at least {len(headers)}"
             )
 
-        row_data = {
-            headers[index]: cell_text(cells[index]) for index in range(len(headers))
-        }
+        number = None
+        if number_column is not None:
+            number = parse_number(cell_text(cells[number_column]))
 
-        release_date = datetime.strptime(row_data["release date"], "%d %B %Y").date()
+        quest_points = 0
+        if quest_points_column is not None:
+            quest_points = int(cell_text(cells[quest_points_column]))
+
+        release_date = parse_release_date(cell_text(cells[release_date_column]))
         quests.append(
             {
-                "number": parse_number(row_data.get("#")),
-                "name": row_data["name"],
-                "difficulty": row_data["difficulty"],
-                "length": row_data["length"],
-                "quest_points": int(row_data[""]) if "" in row_data else 0,
-                "series": parse_series(row_data["series"]),
+                "number": number,
+                "name": cell_text(cells[name_column]),
+                "difficulty": cell_text(cells[difficulty_column]),
+                "length": cell_text(cells[length_column]),
+                "quest_points": quest_points,
+                "series": parse_series(cell_text(cells[series_column])),
                 "release_date": release_date.isoformat(),
             }
         )
@@ -132,66 +207,141 @@ def parse_rows(table: Tag) -> list[dict[str, object]]:
     return quests
 
 
-def parse_quests(html) -> list[dict[str, object]]:
-    soup = BeautifulSoup(html, "html.parser")
-    table = find_quest_table(soup)
-    return parse_rows(table)
+def parse_quests(soup: BeautifulSoup) -> list[dict[str, object]]:
+    table, headers = find_quest_table(soup)
+    return parse_rows(table, headers)
+
+
+def meta_path(page: Page) -> str:
+    return f"{os.path.splitext(page.outputfile)[0]}.meta.json"
+
+
+def file_digest(path: str) -> str:
+    with open(path, "rb") as fh:
+        return hashlib.sha256(fh.read()).hexdigest()
+
+
+def conditional_headers(page: Page) -> dict[str, str]:
+    # Without the previous output there is nothing to fall back on
+    if not os.path.exists(page.outputfile):
+        return {}
+
+    try:
+        with open(meta_path(page)) as fh:
+            meta = json.load(fh)
+    except FileNotFoundError:
+        return {}
+
+    # The output must still be the one written for that response, by this version of update.py
+    if meta.get("output_sha256") != file_digest(page.outputfile):
+        return {}
+    if meta.get("update_sha256") != file_digest(__file__):
+        return {}
+
+    headers: dict[str, str] = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    return headers
+
+
+def write_meta(page: Page, response: requests.Response) -> None:
+    with open(meta_path(page), "w") as fh:
+        fh.write(
+            json.dumps(
+                {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "output_sha256": file_digest(page.outputfile),
+                    "update_sha256": file_digest(__file__),
+                },
+                indent=4,
+            )
+        )
+
+
+def parse_quest_order(soup: BeautifulSoup) -> list[str]:
+    quests: list[str] = []
+
+    for tr in soup.find_all("tr", attrs={"data-rowid": True}):
+        first_link = find_first_link(tr)
+        if not first_link:
+            continue
+
+        if not first_link.parent:
+            continue
+
+        name = QUEST_ORDER_NAME_NOISE_RE.sub(
+            "", first_link.parent.get_text(strip=False)
+        ).strip()
+
+        quests.append(name)
+
+    return quests
+
+
+def fetch_page(
+    session: requests.Session, page: Page, force: bool = False
+) -> requests.Response:
+    params = {
+        "action": "parse",
+        "page": page.page,
+        "prop": "text",
+        "disabletoc": 1,
+        "disableeditsection": 1,
+        # Skips the "NewPP limit report" HTML comment appended to the output
+        "disablelimitreport": 1,
+        "format": "json",
+    }
+    if page.sectiontitle:
+        params["sectiontitle"] = page.sectiontitle
+    elif page.sectionid:
+        params["section"] = page.sectionid
+
+    headers = {} if force else conditional_headers(page)
+    return session.get(WIKI_API_URL, params=params, headers=headers)
 
 
 def main() -> None:
-    for page in PAGES:
-        print(page)
-        params = {
-            "action": "parse",
-            "page": page.page,
-            "prop": "text",
-            "disabletoc": 1,
-            "disableeditsection": 1,
-            "format": "json",
+    # --force downloads and rewrites every page, even if it looks up to date
+    force = "--force" in sys.argv[1:]
+
+    with (
+        requests.Session() as session,
+        ThreadPoolExecutor(max_workers=len(PAGES)) as executor,
+    ):
+        session.headers["User-Agent"] = USER_AGENT
+
+        # Downloads run concurrently, parsing stays on the main thread
+        futures = {
+            executor.submit(fetch_page, session, page, force): page for page in PAGES
         }
-        if page.sectiontitle:
-            params["sectiontitle"] = page.sectiontitle
-        elif page.sectionid:
-            params["section"] = page.sectionid
 
-        data = requests.get(
-            WIKI_API_URL,
-            headers={
-                "User-Agent": USER_AGENT,
-            },
-            params=params,
-        ).json()
+        for future in as_completed(futures):
+            page = futures[future]
+            print(page)
 
-        html = data["parse"]["text"]["*"]
-        soup = BeautifulSoup(html, "html.parser")
+            response = future.result()
+            if response.status_code == 304:
+                print(f"{page.outputfile} is up to date")
+                continue
 
-        quests = []
+            html = response.json()["parse"]["text"]["*"]
+            soup = BeautifulSoup(html, "lxml", parse_only=QUEST_TABLE_STRAINER)
 
-        if page.method == "table":
             quests = []
-            for tr in soup.select("table.oqg-table tr[data-rowid]"):
-                print(f"tr: {tr}\n")
-                first_link = tr.select_one("td a[title]")
-                print(f"first link: {first_link}\n\n")
-                if not first_link:
-                    continue
-
-                if not first_link.parent:
-                    continue
-
-                name = (
-                    first_link.parent.get_text(strip=False)
-                    .replace("Unlock: ", "")
-                    .replace(" (miniquest)", "")
-                    .strip()
-                )
-
-                quests.append(name)
-        elif page.method == "list":
-            quests = parse_quests(html)
-
-        with open(page.outputfile, "w") as fh:
-            fh.write(json.dumps(quests, indent=4))
+
+            if page.method == "table":
+                quests = parse_quest_order(soup)
+            elif page.method == "list":
+                quests = parse_quests(soup)
+
+            with open(page.outputfile, "w") as fh:
+                fh.write(json.dumps(quests, indent=4))
+
+            write_meta(page, response)
 
 
 if __name__ == "__main__":
@@ -2,12 +2,19 @@
 # this will print a list of quests in release date order
 # the idea is for this to be expanded to other quest orders
 
+import contextlib
 import datetime
 import json
 import logging
+import os
+import pickle
 import sys
+import tempfile
+from collections.abc import Callable, Iterable, Iterator
 from dataclasses import asdict, dataclass, is_dataclass
 from enum import Enum
+from functools import cache
+from itertools import chain
 from operator import attrgetter
 
 logging.basicConfig(
@@ -16,12 +23,14 @@ logging.basicConfig(
 )
 log = logging.getLogger(__name__)
 
-UNIMPLEMENTED_QUESTS = (
-    "The Frozen Door",
-    "Into the Tombs",
+UNIMPLEMENTED_QUESTS = frozenset(
+    {
+        "The Frozen Door",
+        "Into the Tombs",
+    }
 )
 
-UNIMPLEMENTED_BUT_NO_INTENTION_TO_ADD_QUESTS = ("Learning the Ropes",)
+UNIMPLEMENTED_BUT_NO_INTENTION_TO_ADD_QUESTS = frozenset({"Learning the Ropes"})
 
 QUEST_HELPER_CUSTOM_ORDER = [
     "Balloon transport system to Crafting Guild",
@@ -42,6 +51,95 @@ QUEST_HELPER_CUSTOM_ORDER = [
     "All Elite Achievement Diaries",
 ]
 
+DIARY_DIFFICULTIES = ("Easy", "Medium", "Hard", "Elite")
+
+# Quests whose Quest Helper enum values don't follow from their wiki name
+SPECIAL_QUEST_ENUMS: dict[str, tuple[str, ...]] = {
+    "Shield of Arrav": (
+        "QuestHelperQuest.SHIELD_OF_ARRAV_BLACK_ARM_GANG",
+        "QuestHelperQuest.SHIELD_OF_ARRAV_PHOENIX_GANG",
+    ),
+    "Desert Treasure I": ("QuestHelperQuest.DESERT_TREASURE",),
+    "Recipe for Disaster": (),
+    "Recipe for Disaster/Another Cook's Quest": (
+        "QuestHelperQuest.RECIPE_FOR_DISASTER_START",
+    ),
+    "Recipe for Disaster/Freeing the Mountain Dwarf": (
+        "QuestHelperQuest.RECIPE_FOR_DISASTER_DWARF",
+    ),
+    "Recipe for Disaster/Freeing the Goblin generals": (
+        "QuestHelperQuest.RECIPE_FOR_DISASTER_WARTFACE_AND_BENTNOZE",
+    ),
+    "Recipe for Disaster/Freeing Pirate Pete": (
+        "QuestHelperQuest.RECIPE_FOR_DISASTER_PIRATE_PETE",
+    ),
+    "Recipe for Disaster/Freeing the Lumbridge Guide": (
+        "QuestHelperQuest.RECIPE_FOR_DISASTER_LUMBRIDGE_GUIDE",
+    ),
+    "Recipe for Disaster/Freeing Evil Dave": (
+        "QuestHelperQuest.RECIPE_FOR_DISASTER_EVIL_DAVE",
+    ),
+    "Recipe for Disaster/Freeing King Awowogei": (
+        "QuestHelperQuest.RECIPE_FOR_DISASTER_MONKEY_AMBASSADOR",
+    ),
+    "Recipe for Disaster/Freeing Sir Amik Varze": (
+        "QuestHelperQuest.RECIPE_FOR_DISASTER_SIR_AMIK_VARZE",
+    ),
+    "Recipe for Disaster/Freeing Skrach Uglogwee": (
+        "QuestHelperQuest.RECIPE_FOR_DISASTER_SKRACH_UGLOGWEE",
+    ),
+    "Recipe for Disaster/Defeating the Culinaromancer": (
+        "QuestHelperQuest.RECIPE_FOR_DISASTER_FINALE",
+    ),
+    "Desert Treasure II - The Fallen Empire": ("QuestHelperQuest.DESERT_TREASURE_II",),
+    # TODO: The ones below should probably be fixed
+    "Perilous Moons": ("QuestHelperQuest.PERILOUS_MOON",),
+    "Mage Arena I": ("QuestHelperQuest.THE_MAGE_ARENA",),
+    "Mage Arena II": ("QuestHelperQuest.THE_MAGE_ARENA_II",),
+    "The Enchanted Key": ("QuestHelperQuest.ENCHANTED_KEY",),
+}
+
+# Names the optimal quest guides use for the Recipe for Disaster subquests
+RFD_ORDER_NAMES: dict[str, str] = {
+    "Recipe for Disaster/Another Cook's Quest": "Recipe for Disaster: Another Cook's quest",
+    "Recipe for Disaster/Freeing the Goblin generals": "Recipe for Disaster: Goblin generals",
+    "Recipe for Disaster/Freeing the Mountain Dwarf": "Recipe for Disaster: Dwarf",
+    "Recipe for Disaster/Freeing Evil Dave": "Recipe for Disaster: Evil Dave",
+    "Recipe for Disaster/Freeing Pirate Pete": "Recipe for Disaster: Pirate Pete",
+    "Recipe for Disaster/Freeing the Lumbridge Guide": "Recipe for Disaster: Lumbridge Guide",
+    "Recipe for Disaster/Freeing Skrach Uglogwee": "Recipe for Disaster: Skrach Uglogwee",
+    "Recipe for Disaster/Freeing Sir Amik Varze": "Recipe for Disaster: Sir Amik Varze",
+    "Recipe for Disaster/Freeing King Awowogei": "Recipe for Disaster: Awowogei",
+    "Recipe for Disaster/Defeating the Culinaromancer": "Recipe for Disaster: Defeating the Culinaromancer",
+}
+
+# Quests that are not explicitly part of the ironman wiki order
+# Each one is put under another quest, which is the same order it has in the normal wiki order
+IRONMAN_ORDER_FALLBACKS: dict[str, tuple[str, int]] = {
+    # Mentioned during the Romeo & Juliet step, so we put it under it
+    "Stronghold of Security": ("Romeo & Juliet", 110),
+    "Meat and Greet": ("Cabin Fever", 110),
+    "Death on the Isle": ("The Feud", 110),
+    "His Faithful Servants": ("The General's Shadow", 110),
+    "Ethically Acquired Antiquities": ("Monkey Madness I", 110),
+    "The Curse of Arrav": ("Dragon Slayer II", 110),
+    "In Search of Knowledge": ("The Corsair Curse", 110),
+    # Sorted right after In Search of Knowledge
+    "Hopespear's Will": ("The Corsair Curse", 120),
+}
+
+
+def order_index(order: list[str]) -> dict[str, int]:
+    # Same result as order.index(name): the first occurrence of a name wins
+    index: dict[str, int] = {}
+    for i, name in enumerate(order):
+        index.setdefault(name, i)
+
+    return index
+
+
+QUEST_HELPER_CUSTOM_ORDER_INDEX = order_index(QUEST_HELPER_CUSTOM_ORDER)
+
 
 class DCJSONEncoder(json.JSONEncoder):
     def default(self, o):
@@ -54,6 +152,20 @@ class DCJSONEncoder(json.JSONEncoder):
         return super().default(o)
 
 
+# Single characters replaced or dropped from quest names in one str.translate pass
+CLEAN_QUEST_NAME_TABLE = str.maketrans(
+    {
+        " ": "_",
+        "'": None,
+        "&": None,
+        ".": None,
+        "!": None,
+        "-": None,
+    }
+)
+
+
+@cache
 def clean_quest_name(quest_name: str) -> str:
     return (
         quest_name.upper()
@@ -65,13 +177,7 @@ def clean_quest_name(quest_name: str) -> str:
         )  # for achievement diaries, should be removed
         .replace(" DIARY", "")  # for achievement diaries, should be removed
         .replace(" (MINIQUEST)", "")
-        .replace(" ", "_")
-        .replace("'", "")
-        .replace("&", "")
-        .replace(".", "")
-        .replace("!", "")
-        .replace("-", "")
-        .replace("Unlock: ", "")
+        .translate(CLEAN_QUEST_NAME_TABLE)
     )
 
 
@@ -87,7 +193,7 @@ class QuestType(int, Enum):
     BALLOON_UNLOCK = 5
 
 
-@dataclass
+@dataclass(slots=True)
 class Quest:
     quest_type: QuestType
 
@@ -130,29 +236,20 @@ class Quest:
 
     def load_order(
         self,
-        optimal_quest_order: list[str],
-        ironman_optimal_quest_order: list[str],
+        optimal_quest_index: dict[str, int],
+        ironman_optimal_quest_index: dict[str, int],
         custom_name: str | None = None,
     ):
         name = custom_name or self.name
 
         if self.qh_order == -1:
-            try:
-                self.qh_order = QUEST_HELPER_CUSTOM_ORDER.index(name)
-            except ValueError:
-                pass
+            self.qh_order = QUEST_HELPER_CUSTOM_ORDER_INDEX.get(name, -1)
 
         if self.optimal_order == -1:
-            try:
-                self.optimal_order = optimal_quest_order.index(name)
-            except ValueError:
-                pass
+            self.optimal_order = optimal_quest_index.get(name, -1)
 
         if self.optimal_ironman_order == -1:
-            try:
-                self.optimal_ironman_order = ironman_optimal_quest_order.index(name)
-            except ValueError:
-                pass
+            self.optimal_ironman_order = ironman_optimal_quest_index.get(name, -1)
 
         if custom_name is None:
             if self.quest_type == QuestType.ACHIEVEMENT_DIARY:
@@ -160,143 +257,31 @@ class Quest:
                     case "Lumbridge":
                         # to handle
                         self.load_order(
-                            optimal_quest_order,
-                            ironman_optimal_quest_order,
+                            optimal_quest_index,
+                            ironman_optimal_quest_index,
                             f"{self.diary_difficulty} Lumbridge & Draynor Diary",
                         )
 
                 self.load_order(
-                    optimal_quest_order,
-                    ironman_optimal_quest_order,
+                    optimal_quest_index,
+                    ironman_optimal_quest_index,
                     f"All {self.diary_difficulty} Achievement Diaries",
                 )
 
             # Some quest names in the ironman guide are weird, try to handle them here
-            match name:
-                case "Recipe for Disaster/Another Cook's Quest":
-                    self.load_order(
-                        optimal_quest_order,
-                        ironman_optimal_quest_order,
-                        "Recipe for Disaster: Another Cook's quest",
-                    )
-                case "Recipe for Disaster/Freeing the Goblin generals":
-                    self.load_order(
-                        optimal_quest_order,
-                        ironman_optimal_quest_order,
-                        "Recipe for Disaster: Goblin generals",
-                    )
-                case "Recipe for Disaster/Freeing the Mountain Dwarf":
-                    self.load_order(
-                        optimal_quest_order,
-                        ironman_optimal_quest_order,
-                        "Recipe for Disaster: Dwarf",
-                    )
-                case "Recipe for Disaster/Freeing Evil Dave":
-                    self.load_order(
-                        optimal_quest_order,
-                        ironman_optimal_quest_order,
-                        "Recipe for Disaster: Evil Dave",
-                    )
-                case "Recipe for Disaster/Freeing Pirate Pete":
-                    self.load_order(
-                        optimal_quest_order,
-                        ironman_optimal_quest_order,
-                        "Recipe for Disaster: Pirate Pete",
-                    )
-                case "Recipe for Disaster/Freeing the Lumbridge Guide":
-                    self.load_order(
-                        optimal_quest_order,
-                        ironman_optimal_quest_order,
-                        "Recipe for Disaster: Lumbridge Guide",
-                    )
-                case "Recipe for Disaster/Freeing Skrach Uglogwee":
-                    self.load_order(
-                        optimal_quest_order,
-                        ironman_optimal_quest_order,
-                        "Recipe for Disaster: Skrach Uglogwee",
-                    )
-                case "Recipe for Disaster/Freeing Sir Amik Varze":
-                    self.load_order(
-                        optimal_quest_order,
-                        ironman_optimal_quest_order,
-                        "Recipe for Disaster: Sir Amik Varze",
-                    )
-                case "Recipe for Disaster/Freeing King Awowogei":
-                    self.load_order(
-                        optimal_quest_order,
-                        ironman_optimal_quest_order,
-                        "Recipe for Disaster: Awowogei",
-                    )
-                case "Recipe for Disaster/Defeating the Culinaromancer":
-                    self.load_order(
-                        optimal_quest_order,
-                        ironman_optimal_quest_order,
-                        "Recipe for Disaster: Defeating the Culinaromancer",
-                    )
-                case "Stronghold of Security":
-                    # Stronghold of Security is not explicitly part of the ironman wiki order
-                    # It's mentioned during the Romeo & Juliet step, so we put it under it
-                    if self.optimal_ironman_order == -1:
-                        self.optimal_ironman_order = ironman_optimal_quest_order.index(
-                            "Romeo & Juliet"
-                        )
-                        self.ironman_sub_order = 110
-                case "Meat and Greet":
-                    # Meat and Greet is not explicitly part of the ironman wiki order
-                    # We put it under Cabin Fever which is the same order it has in the normal wiki order
-                    if self.optimal_ironman_order == -1:
-                        self.optimal_ironman_order = ironman_optimal_quest_order.index(
-                            "Cabin Fever"
-                        )
-                        self.ironman_sub_order = 110
-                case "Death on the Isle":
-                    # Death on the Isle is not explicitly part of the ironman wiki order
-                    # We put it under The Feud which is the same order it has in the normal wiki order
-                    if self.optimal_ironman_order == -1:
-                        self.optimal_ironman_order = ironman_optimal_quest_order.index(
-                            "The Feud"
-                        )
-                        self.ironman_sub_order = 110
-                case "His Faithful Servants":
-                    # His Faithful Servants is not explicitly part of the ironman wiki order
-                    # We put it under The General's Shadow which is the same order it has in the normal wiki order
-                    if self.optimal_ironman_order == -1:
-                        self.optimal_ironman_order = ironman_optimal_quest_order.index(
-                            "The General's Shadow"
-                        )
-                        self.ironman_sub_order = 110
-                case "Ethically Acquired Antiquities":
-                    # Ethically Acquired Antiquities is not explicitly part of the ironman wiki order
-                    # We put it under Monkey Madness I which is the same order it has in the normal wiki order
-                    if self.optimal_ironman_order == -1:
-                        self.optimal_ironman_order = ironman_optimal_quest_order.index(
-                            "Monkey Madness I"
-                        )
-                        self.ironman_sub_order = 110
-                case "The Curse of Arrav":
-                    # The Curse of Arrav is not explicitly part of the ironman wiki order
-                    # We put it under Dragon Slayer II which is the same order it has in the normal wiki order
-                    if self.optimal_ironman_order == -1:
-                        self.optimal_ironman_order = ironman_optimal_quest_order.index(
-                            "Dragon Slayer II"
-                        )
-                        self.ironman_sub_order = 110
-                case "In Search of Knowledge":
-                    # In Search of Knowledge is not explicitly part of the ironman wiki order
-                    # We put it under Sins of the Father which is the same order it has in the normal wiki order
-                    if self.optimal_ironman_order == -1:
-                        self.optimal_ironman_order = ironman_optimal_quest_order.index(
-                            "The Corsair Curse"
-                        )
-                        self.ironman_sub_order = 110
-                case "Hopespear's Will":
-                    # Hopespear's Will is not explicitly part of the ironman wiki order
-                    # We put it under In Search of Knowledge which is the same order it has in the normal wiki order
-                    if self.optimal_ironman_order == -1:
-                        self.optimal_ironman_order = ironman_optimal_quest_order.index(
-                            "The Corsair Curse"
-                        )
-                        self.ironman_sub_order = 120
+            alias = RFD_ORDER_NAMES.get(name)
+            if alias is not None:
+                self.load_order(
+                    optimal_quest_index,
+                    ironman_optimal_quest_index,
+                    alias,
+                )
+
+            fallback = IRONMAN_ORDER_FALLBACKS.get(name)
+            if fallback is not None and self.optimal_ironman_order == -1:
+                parent, sub_order = fallback
+                self.optimal_ironman_order = ironman_optimal_quest_index[parent]
+                self.ironman_sub_order = sub_order
 
     def quest_helper_enum_values(self) -> list[str]:
         if self.name in UNIMPLEMENTED_QUESTS:
@@ -317,117 +302,17 @@ class Quest:
         if self.quest_type == QuestType.ACHIEVEMENT_DIARY:
             # TODO: Fix this to just align with osrs wiki naming?
 
-            if "Easy" in self.name:
-                return [
-                    f"QuestHelperQuest.{clean_quest_name(self.name.replace('Easy ', ''))}_EASY",
-                ]
-            elif "Medium" in self.name:
+            difficulty = self.diary_difficulty
+            if difficulty in DIARY_DIFFICULTIES:
                 return [
-                    f"QuestHelperQuest.{clean_quest_name(self.name.replace('Medium ', ''))}_MEDIUM",
-                ]
-            elif "Hard" in self.name:
-                return [
-                    f"QuestHelperQuest.{clean_quest_name(self.name.replace('Hard ', ''))}_HARD",
-                ]
-            elif "Elite" in self.name:
-                return [
-                    f"QuestHelperQuest.{clean_quest_name(self.name.replace('Elite ', ''))}_ELITE",
+                    f"QuestHelperQuest.{clean_quest_name(self.name.removeprefix(f'{difficulty} '))}_{difficulty.upper()}",
                 ]
             else:
                 assert f"unhandled achievement diary difficulty for {self.name}"
 
-        if self.name == "Shield of Arrav":
-            return [
-                "QuestHelperQuest.SHIELD_OF_ARRAV_BLACK_ARM_GANG",
-                "QuestHelperQuest.SHIELD_OF_ARRAV_PHOENIX_GANG",
-            ]
-
-        if self.name == "Desert Treasure I":
-            return [
-                "QuestHelperQuest.DESERT_TREASURE",
-            ]
-
-        if self.name == "Recipe for Disaster":
-            return []
-
-        if self.name == "Recipe for Disaster/Another Cook's Quest":
-            return [
-                "QuestHelperQuest.RECIPE_FOR_DISASTER_START",
-            ]
-
-        if self.name == "Recipe for Disaster/Freeing the Mountain Dwarf":
-            return [
-                "QuestHelperQuest.RECIPE_FOR_DISASTER_DWARF",
-            ]
-
-        if self.name == "Recipe for Disaster/Freeing the Goblin generals":
-            return [
-                "QuestHelperQuest.RECIPE_FOR_DISASTER_WARTFACE_AND_BENTNOZE",
-            ]
-
-        if self.name == "Recipe for Disaster/Freeing Pirate Pete":
-            return [
-                "QuestHelperQuest.RECIPE_FOR_DISASTER_PIRATE_PETE",
-            ]
-
-        if self.name == "Recipe for Disaster/Freeing the Lumbridge Guide":
-            return [
-                "QuestHelperQuest.RECIPE_FOR_DISASTER_LUMBRIDGE_GUIDE",
-            ]
-
-        if self.name == "Recipe for Disaster/Freeing Evil Dave":
-            return [
-                "QuestHelperQuest.RECIPE_FOR_DISASTER_EVIL_DAVE",
-            ]
-
-        if self.name == "Recipe for Disaster/Freeing King Awowogei":
-            return [
-                "QuestHelperQuest.RECIPE_FOR_DISASTER_MONKEY_AMBASSADOR",
-            ]
-
-        if self.name == "Recipe for Disaster/Freeing Sir Amik Varze":
-            return [
-                "QuestHelperQuest.RECIPE_FOR_DISASTER_SIR_AMIK_VARZE",
-            ]
-
-        if self.name == "Recipe for Disaster/Freeing Skrach Uglogwee":
-            return [
-                "QuestHelperQuest.RECIPE_FOR_DISASTER_SKRACH_UGLOGWEE",
-            ]
-
-        if self.name == "Recipe for Disaster/Defeating the Culinaromancer":
-            return [
-                "QuestHelperQuest.RECIPE_FOR_DISASTER_FINALE",
-            ]
-
-        if self.name == "Desert Treasure II - The Fallen Empire":
-            return [
-                "QuestHelperQuest.DESERT_TREASURE_II",
-            ]
-
-        if self.name == "Perilous Moons":
-            # TODO: This should probably be fixed
-            return [
-                "QuestHelperQuest.PERILOUS_MOON",
-            ]
-
-        if self.name == "Mage Arena I":
-            # TODO: This should probably be fixed
-            return [
-                "QuestHelperQuest.THE_MAGE_ARENA",
-            ]
-
-        if self.name == "Mage Arena II":
-            # TODO: This should probably be fixed
-            return [
-                "QuestHelperQuest.THE_MAGE_ARENA_II",
-            ]
-
-        if self.name == "The Enchanted Key":
-            # TODO: This should probably be fixed
-            return [
-                "QuestHelperQuest.ENCHANTED_KEY",
-            ]
+        quest_enums = SPECIAL_QUEST_ENUMS.get(self.name)
+        if quest_enums is not None:
+            return list(quest_enums)
 
         return [f"QuestHelperQuest.{clean_quest_name(self.name)}"]
 
@@ -435,13 +320,11 @@ class Quest:
 def load_quests(
     path: str,
     quest_type: QuestType,
-    optimal_quest_order: list[str],
-    ironman_optimal_quest_order: list[str],
 ) -> list[Quest]:
     quests: list[Quest] = []
 
     with open(path) as fh:
-        payload = json.loads(fh.read())
+        payload = json.load(fh)
         for p in payload:
             number = p["number"]
             subnumber = None
@@ -459,10 +342,9 @@ def load_quests(
                 p["length"],
                 p["quest_points"],
                 p["series"],
-                datetime.datetime.strptime(p["release_date"], "%Y-%m-%d"),
+                datetime.datetime.fromisoformat(p["release_date"]),
             )
 
-            q.load_order(optimal_quest_order, ironman_optimal_quest_order)
             quests.append(q)
 
     return quests
@@ -471,8 +353,6 @@ def load_quests(
 def custom_quest(
     name: str,
     release_date: datetime.datetime,
-    optimal_quest_order: list[str],
-    ironman_optimal_quest_order: list[str],
 ) -> Quest:
     q = Quest(
         QuestType.CUSTOM_QUEST,
@@ -486,16 +366,12 @@ def custom_quest(
         release_date,
     )
 
-    q.load_order(optimal_quest_order, ironman_optimal_quest_order)
-
     return q
 
 
 def balloon_unlock(
     name: str,
     release_date: datetime.datetime,
-    optimal_quest_order: list[str],
-    ironman_optimal_quest_order: list[str],
 ) -> Quest:
     q = Quest(
         QuestType.BALLOON_UNLOCK,
@@ -509,8 +385,6 @@ def balloon_unlock(
         release_date,
     )
 
-    q.load_order(optimal_quest_order, ironman_optimal_quest_order)
-
     return q
 
 
@@ -518,8 +392,6 @@ def diary(
     difficulty: str,
     region: str,
     release_date: datetime.datetime,
-    optimal_quest_order: list[str],
-    ironman_optimal_quest_order: list[str],
 ) -> Quest:
     name = f"{difficulty} {region} Diary"
 
@@ -537,8 +409,6 @@ def diary(
         diary_difficulty=difficulty,
     )
 
-    q.load_order(optimal_quest_order, ironman_optimal_quest_order)
-
     return q
 
 
@@ -546,7 +416,6 @@ def load_quest_list(
     optimal_quest_order: list[str],
     ironman_optimal_quest_order: list[str],
 ) -> list[Quest]:
-    DIARY_DIFFICULTIES = ["Easy", "Medium", "Hard", "Elite"]
     DIARIES = [
         ("Ardougne", datetime.datetime(2015, 3, 5)),
         ("Desert", datetime.datetime(2015, 3, 5)),
@@ -566,38 +435,26 @@ def load_quest_list(
         custom_quest(
             "Stronghold of Security",
             datetime.datetime(2006, 7, 4),
-            optimal_quest_order,
-            ironman_optimal_quest_order,
         ),
         custom_quest(
             "Knight Waves Training Grounds",
             datetime.datetime(2007, 7, 24),
-            optimal_quest_order,
-            ironman_optimal_quest_order,
         ),
         balloon_unlock(
             "Balloon transport system to Crafting Guild",
             datetime.datetime(2006, 11, 6),
-            optimal_quest_order,
-            ironman_optimal_quest_order,
         ),
         balloon_unlock(
             "Balloon transport system to Varrock",
             datetime.datetime(2006, 11, 6),
-            optimal_quest_order,
-            ironman_optimal_quest_order,
         ),
         balloon_unlock(
             "Balloon transport system to Castle Wars",
             datetime.datetime(2006, 11, 6),
-            optimal_quest_order,
-            ironman_optimal_quest_order,
         ),
         balloon_unlock(
             "Balloon transport system to Grand Tree",
             datetime.datetime(2006, 11, 6),
-            optimal_quest_order,
-            ironman_optimal_quest_order,
         ),
     ]
     for difficulty in DIARY_DIFFICULTIES:
@@ -607,31 +464,31 @@ def load_quest_list(
                     difficulty,
                     region,
                     release_date,
-                    optimal_quest_order,
-                    ironman_optimal_quest_order,
                 )
             )
 
     f2p_quests = load_quests(
         "data/free-to-play-quests.json",
         QuestType.FREE_TO_PLAY_QUEST,
-        optimal_quest_order,
-        ironman_optimal_quest_order,
     )
     members_quests = load_quests(
         "data/members-quests.json",
         QuestType.MEMBERS_QUEST,
-        optimal_quest_order,
-        ironman_optimal_quest_order,
     )
     mini_quests = load_quests(
         "data/miniquests.json",
         QuestType.MINI_QUEST,
-        optimal_quest_order,
-        ironman_optimal_quest_order,
     )
 
-    return custom_quests + f2p_quests + members_quests + mini_quests
+    quests = custom_quests + f2p_quests + members_quests + mini_quests
+
+    # Orders are resolved in one pass once every quest is loaded
+    optimal_quest_index = order_index(optimal_quest_order)
+    ironman_optimal_quest_index = order_index(ironman_optimal_quest_order)
+    for q in quests:
+        q.load_order(optimal_quest_index, ironman_optimal_quest_index)
+
+    return quests
 
 
 def load_optimal_quest_order() -> list[str]:
@@ -644,197 +501,226 @@ def load_ironman_optimal_quest_order() -> list[str]:
         return json.load(fh)
 
 
+# The parsed quest list is cached here between runs
+QUEST_LIST_CACHE_PATH = ".cache/quests.pkl"
+
+# Everything the parsed quest list is derived from, including this file
+QUEST_LIST_SOURCES = (
+    __file__,
+    "data/optimal-quest-guide.json",
+    "data/ironman-optimal-quest-guide.json",
+    "data/free-to-play-quests.json",
+    "data/members-quests.json",
+    "data/miniquests.json",
+)
+
+
+def load_cached_quest_list() -> list[Quest]:
+    key = [(st.st_mtime_ns, st.st_size) for st in map(os.stat, QUEST_LIST_SOURCES)]
+
+    try:
+        with open(QUEST_LIST_CACHE_PATH, "rb") as fh:
+            cached_key, quests = pickle.load(fh)
+        if cached_key == key:
+            return quests
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        # e.g. a cache written by an older version of the Quest dataclass
+        log.debug(f"Ignoring unreadable quest list cache: {e}")
+
+    quests = load_quest_list(
+        load_optimal_quest_order(), load_ironman_optimal_quest_order()
+    )
+
+    write_cached_quest_list(key, quests)
+
+    return quests
+
+
+def write_cached_quest_list(key: list[tuple[int, int]], quests: list[Quest]) -> None:
+    # The cache is only an optimisation, so failing to write it must not stop the output
+    cache_dir = os.path.dirname(QUEST_LIST_CACHE_PATH)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    except OSError as e:
+        log.debug(f"Not writing quest list cache: {e}")
+        return
+
+    # Moved into place once complete, so a killed or concurrent run never leaves a partial pickle
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            pickle.dump((key, quests), fh)
+        os.replace(tmp_path, QUEST_LIST_CACHE_PATH)
+    except OSError as e:
+        log.debug(f"Not writing quest list cache: {e}")
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+
+
 def sort_by_release_date(quest: Quest):
     return (
         quest.release_date,
-        quest.number or -1,
-        quest.subnumber or -1,
+        quest.number if quest.number is not None else -1,
+        quest.subnumber if quest.subnumber is not None else -1,
         quest.name,
     )
 
 
-def print_quest_order_by_release_date(quests: list[Quest]) -> None:
-    body = ""
-
-    body += "\t\t// Quests\n"
-    for quest in filter(
-        lambda q: (
-            q.quest_type in (QuestType.FREE_TO_PLAY_QUEST, QuestType.MEMBERS_QUEST)
-        ),
-        sorted(quests, key=sort_by_release_date),
-    ):
-        quest_enums = quest.quest_helper_enum_values()
-        for s in quest_enums:
-            if s.strip().startswith("//"):
-                body += f"\t\t{s}\n"
+def quest_enum_lines(
+    quests: Iterable[Quest], include_comments: bool = True
+) -> Iterator[str]:
+    for quest in quests:
+        for s in quest.quest_helper_enum_values():
+            if s.startswith("//"):
+                if include_comments:
+                    yield f"\t\t{s}"
             else:
-                body += f"\t\t{s},\n"
+                yield f"\t\t{s},"
 
-    body += "\t\t// Miniquests\n"
-    for quest in filter(
-        lambda q: q.quest_type == QuestType.MINI_QUEST,
-        sorted(quests, key=sort_by_release_date),
-    ):
-        quest_enums = quest.quest_helper_enum_values()
-        for s in quest_enums:
-            if s.strip().startswith("//"):
-                body += f"\t\t{s}\n"
-            else:
-                body += f"\t\t{s},\n"
 
-    print(body.strip().rstrip(","))
+def write_enum_lines(lines: Iterable[str]) -> None:
+    # Same output as print("\n".join(lines).strip().rstrip(",")), written as the lines come in
+    pending: str | None = None
+    for line in lines:
+        if pending is None:
+            pending = line.lstrip()
+            continue
 
+        sys.stdout.write(f"{pending}\n")
+        pending = line
 
-def print_quests_enum_by_optimal_order(quests: list[Quest]) -> None:
-    body = ""
+    if pending is None:
+        pending = ""
+
+    sys.stdout.write(f"{pending.rstrip().rstrip(',')}\n")
 
-    for quest in filter(
-        lambda q: q.optimal_order > -1,
-        sorted(quests, key=attrgetter("optimal_order", "sub_order")),
-    ):
-        quest_enums = quest.quest_helper_enum_values()
-        for s in quest_enums:
-            if s.strip().startswith("//"):
-                body += f"\t\t{s}\n"
-            else:
-                body += f"\t\t{s},\n"
 
-    unordered_quests = list(
-        filter(
-            lambda q: q.optimal_order == -1,
-            sorted(quests, key=attrgetter("qh_order", "name")),
+def print_quest_order_by_release_date(quests: list[Quest]) -> None:
+    regular_quests: list[Quest] = []
+    mini_quests: list[Quest] = []
+    for quest in quests:
+        if quest.quest_type in (QuestType.FREE_TO_PLAY_QUEST, QuestType.MEMBERS_QUEST):
+            regular_quests.append(quest)
+        elif quest.quest_type == QuestType.MINI_QUEST:
+            mini_quests.append(quest)
+
+    regular_quests.sort(key=sort_by_release_date)
+    mini_quests.sort(key=sort_by_release_date)
+
+    write_enum_lines(
+        chain(
+            ["\t\t// Quests"],
+            quest_enum_lines(regular_quests),
+            ["\t\t// Miniquests"],
+            quest_enum_lines(mini_quests),
         )
     )
-    if len(unordered_quests) > 0:
-        body += "\t\t// Quests & mini quests that are not part of the OSRS Wiki's Optimal Quest Guide\n"
 
-        for quest in unordered_quests:
-            quest_enums = quest.quest_helper_enum_values()
-            for s in quest_enums:
-                if s.strip().startswith("//"):
-                    continue
-                else:
-                    body += f"\t\t{s},\n"
-                    # body += f"\t\t// {quest.qh_order} ({quest.name}),\n"
 
-    print(body.strip().rstrip(","))
+def print_quests_enum_by_optimal_order(quests: list[Quest]) -> None:
+    ordered_quests: list[Quest] = []
+    unordered_quests: list[Quest] = []
+    for quest in quests:
+        if quest.optimal_order > -1:
+            ordered_quests.append(quest)
+        else:
+            unordered_quests.append(quest)
+
+    ordered_quests.sort(key=attrgetter("optimal_order", "sub_order"))
+    unordered_quests.sort(key=attrgetter("qh_order", "name"))
+
+    lines = quest_enum_lines(ordered_quests)
+
+    if len(unordered_quests) > 0:
+        lines = chain(
+            lines,
+            [
+                "\t\t// Quests & mini quests that are not part of the OSRS Wiki's Optimal Quest Guide"
+            ],
+            quest_enum_lines(unordered_quests, include_comments=False),
+        )
+
+    write_enum_lines(lines)
 
 
 def print_quests_enum_by_ironman_optimal_order(quests: list[Quest]) -> None:
-    body = ""
+    ordered_quests: list[Quest] = []
+    unordered_quests: list[Quest] = []
+    for quest in quests:
+        if quest.optimal_ironman_order > -1:
+            ordered_quests.append(quest)
+        else:
+            unordered_quests.append(quest)
 
-    for quest in filter(
-        lambda q: q.optimal_ironman_order > -1,
-        sorted(quests, key=attrgetter("optimal_ironman_order", "ironman_sub_order")),
-    ):
-        quest_enums = quest.quest_helper_enum_values()
-        for s in quest_enums:
-            if s.strip().startswith("//"):
-                body += f"\t\t{s}\n"
-            else:
-                body += f"\t\t{s},\n"
+    ordered_quests.sort(key=attrgetter("optimal_ironman_order", "ironman_sub_order"))
+    unordered_quests.sort(key=attrgetter("qh_order", "name"))
 
-            # body += f"\t\t// {quest.optimal_ironman_order} | {quest.qh_order} ({quest.name}),\n"
+    lines = quest_enum_lines(ordered_quests)
 
-    unordered_quests = list(
-        filter(
-            lambda q: q.optimal_ironman_order == -1,
-            sorted(quests, key=attrgetter("qh_order", "name")),
-        )
-    )
     if len(unordered_quests) > 0:
-        body += "\t\t// Quests & mini quests that are not part of the OSRS Wiki's Optimal Ironman Quest Guide\n"
+        lines = chain(
+            lines,
+            [
+                "\t\t// Quests & mini quests that are not part of the OSRS Wiki's Optimal Ironman Quest Guide"
+            ],
+            quest_enum_lines(unordered_quests, include_comments=False),
+        )
+
+    write_enum_lines(lines)
 
-        for quest in unordered_quests:
-            quest_enums = quest.quest_helper_enum_values()
-            for s in quest_enums:
-                if s.strip().startswith("//"):
-                    continue
-                else:
-                    body += f"\t\t{s},\n"
-                    # body += f"\t\t// {quest.qh_order} ({quest.name}),\n"
 
-    print(body.strip().rstrip(","))
+# Commands that print a Quest Helper enum, and the message logged before printing it
+ENUM_COMMANDS: dict[str, tuple[Callable[[list[Quest]], None], str | None]] = {
+    "quests-by-release-date": (print_quest_order_by_release_date, None),
+    "quests-by-optimal-order": (
+        print_quests_enum_by_optimal_order,
+        "Outputting optimal quest order - see OptimalQuestGuide.java in Quest Helper",
+    ),
+    "ironman-quests-by-optimal-order": (
+        print_quests_enum_by_ironman_optimal_order,
+        "Outputting optimal ironman quest order - see IronmanOptimalQuestGuide.java in Quest Helper",
+    ),
+}
 
 
 def main() -> None:
-    COMMANDS = [
-        "quests-by-release-date",
-        "quests-by-optimal-order",
-        "ironman-quests-by-optimal-order",
-        "quests",
+    COMMANDS = [*ENUM_COMMANDS, "quests"]
+    SUBCOMMANDS = [
+        "enum",
     ]
 
     command = "quests-by-release-date"
     if len(sys.argv) >= 2:
         command = sys.argv[1]
 
-    optimal_quest_order = load_optimal_quest_order()
-    ironman_optimal_quest_order = load_ironman_optimal_quest_order()
-    quests = load_quest_list(optimal_quest_order, ironman_optimal_quest_order)
+    if command == "quests":
+        print(json.dumps(load_cached_quest_list(), cls=DCJSONEncoder))
+        return
 
-    match command:
-        case "quests-by-release-date":
-            SUBCOMMANDS = [
-                "enum",
-            ]
-            subcommand = "enum"
-            if len(sys.argv) >= 3:
-                subcommand = sys.argv[2]
-
-            match subcommand:
-                case "enum":
-                    print_quest_order_by_release_date(quests)
-                case other:
-                    log.warning(
-                        f"Unknown subcommand '{other}'. Available subcommands: {', '.join(SUBCOMMANDS)}"
-                    )
-
-        case "quests-by-optimal-order":
-            log.info(
-                "Outputting optimal quest order - see OptimalQuestGuide.java in Quest Helper",
-            )
-            SUBCOMMANDS = [
-                "enum",
-            ]
-            subcommand = "enum"
-            if len(sys.argv) >= 3:
-                subcommand = sys.argv[2]
-
-            match subcommand:
-                case "enum":
-                    print_quests_enum_by_optimal_order(quests)
-                case other:
-                    log.warning(
-                        f"Unknown subcommand '{other}'. Available subcommands: {', '.join(SUBCOMMANDS)}"
-                    )
-
-        case "ironman-quests-by-optimal-order":
-            log.info(
-                "Outputting optimal ironman quest order - see IronmanOptimalQuestGuide.java in Quest Helper",
-            )
-            SUBCOMMANDS = [
-                "enum",
-            ]
-            subcommand = "enum"
-            if len(sys.argv) >= 3:
-                subcommand = sys.argv[2]
-
-            match subcommand:
-                case "enum":
-                    print_quests_enum_by_ironman_optimal_order(quests)
-                case other:
-                    log.warning(
-                        f"Unknown subcommand '{other}'. Available subcommands: {', '.join(SUBCOMMANDS)}"
-                    )
-
-        case "quests":
-            print(json.dumps(quests, cls=DCJSONEncoder))
-
-        case other:
-            log.info(
-                f"Unknown command '{other}'. Available commands: {', '.join(COMMANDS)}"
-            )
+    enum_command = ENUM_COMMANDS.get(command)
+    if enum_command is None:
+        log.info(
+            f"Unknown command '{command}'. Available commands: {', '.join(COMMANDS)}"
+        )
+        return
+
+    print_enum, message = enum_command
+    if message is not None:
+        log.info(message)
+
+    subcommand = "enum"
+    if len(sys.argv) >= 3:
+        subcommand = sys.argv[2]
+
+    if subcommand not in SUBCOMMANDS:
+        log.warning(
+            f"Unknown subcommand '{subcommand}'. Available subcommands: {', '.join(SUBCOMMANDS)}"
+        )
+        return
+
+    print_enum(load_cached_quest_list())
 
 
 if __name__ == "__main__":